@@ -2,6 +2,10 @@
 import os
 import re
 import argparse
+import functools
+import locale
+import mmap
+from collections import deque
 from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog, simpledialog
@@ -10,6 +14,8 @@ from tkinter import filedialog, simpledialog
 DEBUG = False
 # Global debug log list
 debug_log = []
+# Buffer size for reading and writing large PGN files
+IO_BUFFER_SIZE = 1 << 20
 
 # Chess piece mapping
 # Key: numeric piece code (odd for white, even for black)
@@ -23,6 +29,116 @@ PIECE_MAP = {
     11: 'Q', 12: 'Q'  # Queen (white/black)
 }
 
+# Piece symbols indexed by piece code ('' for empty squares and unknown codes);
+# covers every value a board square can hold
+PIECE_SYMBOLS = tuple(PIECE_MAP.get(code, '') for code in range(256))
+
+# Piece colours indexed by piece code (1 for white, 2 for black, 0 for empty squares)
+PIECE_COLORS = tuple(2 - code % 2 if code else 0 for code in range(256))
+
+# Translation table from piece code to the byte printed by print_board ('.' for empty)
+BOARD_SYMBOL_TABLE = bytes(ord(PIECE_MAP.get(code, '.')) for code in range(256))
+
+# Precompiled regular expressions used while parsing Ludii moves
+_RE_MOVE_LINE = re.compile(r'^Move=.*', re.MULTILINE)
+# The lookahead reads a promotion's piece code without consuming the fields
+# that follow "Promote:", so they are still found by the same scan
+_RE_MOVE_FIELDS = re.compile(r'(mover|from|to)=(\d+)|Promote:(?=.*?what=(\d+))')
+_RE_NOTE = re.compile(r'\[Note:message=(.*?),to=(\d+)\]')
+_RE_SETUP = re.compile(r'Move=\[Move:mover=0.*?\]')
+_RE_FIRST_PLAYER_MOVE = re.compile(r'^Move=\[Move:mover=[1-9]', re.MULTILINE)
+_RE_TO_WHAT = re.compile(r'to=(\d+),.*?what=(\d+)')
+_RE_NOTES_BRACES = re.compile(r'\s*\{[^}]*\}')
+_RE_ROUND_SUFFIX = re.compile(r'-\d+$')
+
+# Square name lookup tables
+# _LUDII_TO_ALG[coord] is the algebraic name of a Ludii coordinate (0 is a1, 63 is h8)
+_LUDII_TO_ALG = tuple(f"{file}{rank}" for rank in range(1, 9) for file in 'abcdefgh')
+_ALG_TO_LUDII = {square: coord for coord, square in enumerate(_LUDII_TO_ALG)}
+
+# Standard chess starting position
+# Key: square in algebraic notation
+# Value: piece code
+EXPECTED_SETUP = {
+    'a1': 3, 'b1': 9, 'c1': 7, 'd1': 11, 'e1': 5, 'f1': 7, 'g1': 9, 'h1': 3,
+    'a2': 1, 'b2': 1, 'c2': 1, 'd2': 1, 'e2': 1, 'f2': 1, 'g2': 1, 'h2': 1,
+    'a7': 2, 'b7': 2, 'c7': 2, 'd7': 2, 'e7': 2, 'f7': 2, 'g7': 2, 'h7': 2,
+    'a8': 4, 'b8': 10, 'c8': 8, 'd8': 12, 'e8': 6, 'f8': 8, 'g8': 10, 'h8': 4
+}
+# The same position laid out like BoardState.pieces, so a setup can be checked
+# with a single comparison
+EXPECTED_SETUP_PIECES = bytes(EXPECTED_SETUP.get(square, 0) for square in _LUDII_TO_ALG)
+
+# King moves written as castling
+# Key: (from_coord, to_coord) as Ludii coordinates (e1-g1, e1-c1, e8-g8, e8-c8)
+# Value: castling notation
+CASTLING_MOVES = {(4, 6): "O-O", (4, 2): "O-O-O", (60, 62): "O-O", (60, 58): "O-O-O"}
+
+# Debug log lines that belong to an ignored setup or illegal move, classified by prefix
+# in one match: "both" lines (and blank lines) are context for either kind of move
+_RE_CONTEXT_LINE = re.compile(
+    r'(?P<both>Move|Original:|\s*$)'
+    r'|(?P<setup>Debugging parse_ludii_move|Black components before move)'
+    r'|(?P<illegal>Parsing illegal move:|Illegal move detected)'
+)
+# Key: group name matched by _RE_CONTEXT_LINE (None if no match)
+# Value: (setup context, illegal context) flags of the line
+CONTEXT_FLAGS = {
+    None: (False, False),
+    'both': (True, True),
+    'setup': (True, False),
+    'illegal': (False, True),
+}
+
+# Pawn capture targets
+# Key: player (1 for white, 2 for black)
+# Value: for each Ludii coordinate, the on-board squares a pawn there can capture on
+PAWN_CAPTURE_TARGETS = {
+    player: tuple(
+        tuple(
+            (coord // 8 + rank_step) * 8 + cap_file
+            for cap_file in (coord % 8 - 1, coord % 8 + 1)
+            if 0 <= cap_file < 8 and 0 <= coord // 8 + rank_step < 8
+        )
+        for coord in range(64)
+    )
+    for player, rank_step in ((1, 1), (2, -1))
+}
+
+# Number of piece codes with their own bitboard in BoardState (1 to 12, 0 is empty)
+PIECE_CODES = 13
+
+# File and rank bitboards (bit n stands for Ludii coordinate n)
+FILE_MASKS = tuple(sum(1 << (rank * 8 + file) for rank in range(8)) for file in range(8))
+RANK_MASKS = tuple(0xFF << (rank * 8) for rank in range(8))
+
+# Squares a piece may reach, by piece symbol
+# Key: piece symbol
+# Value: test on the (file_diff, rank_diff) distance between two squares
+_PIECE_GEOMETRY = {
+    'R': lambda file_diff, rank_diff: file_diff == 0 or rank_diff == 0,
+    'N': lambda file_diff, rank_diff: (file_diff, rank_diff) in ((1, 2), (2, 1)),
+    'B': lambda file_diff, rank_diff: file_diff == rank_diff,
+    'Q': lambda file_diff, rank_diff: file_diff == 0 or rank_diff == 0 or file_diff == rank_diff,
+    'K': lambda file_diff, rank_diff: file_diff <= 1 and rank_diff <= 1,
+}
+_SYMBOL_ATTACKS = {
+    symbol: tuple(
+        sum(1 << to_coord for to_coord in range(64)
+            if reaches(abs(coord % 8 - to_coord % 8), abs(coord // 8 - to_coord // 8)))
+        for coord in range(64)
+    )
+    for symbol, reaches in _PIECE_GEOMETRY.items()
+}
+
+# Attack bitboards
+# Key: piece code
+# Value: for each Ludii coordinate, the bitboard of squares the piece can move to from
+#        there (every square for pawns and unknown codes)
+PIECE_ATTACKS = tuple(
+    _SYMBOL_ATTACKS.get(PIECE_SYMBOLS[code], ((1 << 64) - 1,) * 64) for code in range(256)
+)
+
 # Utility functions
 
 def debug_print(*args, **kwargs):
@@ -58,6 +174,17 @@ def ensure_file_extension(file_path, extension):
         return file_path + extension
     return file_path
 
+@functools.lru_cache(maxsize=128)
+def _file_creation_date(file_path):
+    """
+    Returns the creation date of a file in "YYYY.MM.DD" format.
+    
+    Raises the underlying error if the file can't be stat'ed. Only
+    successful lookups are cached, since lru_cache doesn't store exceptions.
+    """
+    creation_time = os.path.getctime(file_path)
+    return datetime.fromtimestamp(creation_time).strftime("%Y.%m.%d")
+
 def get_file_creation_date(file_path):
     """
     Gets the creation date of the file.
@@ -72,14 +199,84 @@ def get_file_creation_date(file_path):
     Uses os.path.getctime() to get the creation timestamp,
     converts it to a datetime object, and formats it as a string.
     Handles exceptions and logs errors to the debug log.
+    Results are cached per path; call get_file_creation_date.cache_clear()
+    to pick up changes to a file made during the same run. Failures are
+    not cached, so they are retried and logged on every call.
     """
     try:
-        creation_time = os.path.getctime(file_path)
-        creation_date = datetime.fromtimestamp(creation_time)
-        return creation_date.strftime("%Y.%m.%d")
+        return _file_creation_date(file_path)
     except Exception as e:
         debug_print(f"Error getting file creation date: {e}")
         return "????.??.??"
+
+get_file_creation_date.cache_clear = _file_creation_date.cache_clear
+
+def read_trial_file(input_file):
+    """
+    Reads the content of a Ludii trial file.
+    
+    Args:
+        input_file (str): Path to the input .trl file.
+    
+    Returns:
+        str: The full content of the file, with newlines normalized to "\\n".
+    
+    The file is memory-mapped and decoded straight from the mapping, so
+    no intermediate bytes copy of the whole file is made. It is decoded with
+    the locale's preferred encoding, the same default open() uses in text mode.
+    """
+    with open(input_file, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            content = str(mapped, locale.getpreferredencoding(False))
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+@functools.lru_cache(maxsize=1)
+def _get_parser():
+    """
+    Builds the command-line parser shared by all input getters.
+    
+    Returns:
+        argparse.ArgumentParser: The parser with every supported option.
+    
+    The parser is built once and cached, so all getters agree on the
+    set of known options.
+    """
+    parser = argparse.ArgumentParser(description="Convert Ludii trial files to PGN.")
+    parser.add_argument("-f", "--files", nargs='+', help="Paths to the input .trl files")
+    parser.add_argument("-o", "--output", help="Path to the output .pgn file")
+    parser.add_argument("-e", "--event", help="Name of the event")
+    parser.add_argument("-w", "--white", help="Name of the white player")
+    parser.add_argument("-b", "--black", help="Name of the black player")
+    return parser
+
+@functools.lru_cache(maxsize=1)
+def _get_args():
+    """
+    Parses the command-line arguments once per run.
+    
+    Returns:
+        argparse.Namespace: The parsed command-line arguments.
+    """
+    return _get_parser().parse_args()
+
+@functools.lru_cache(maxsize=1)
+def _tk_root():
+    """
+    Creates the hidden Tk root window used by the input dialogs.
+    
+    Returns:
+        tk.Tk: The withdrawn root window.
+    
+    The root is created on first use and then reused, so the Tk
+    interpreter is initialized only once per run and no windows leak.
+    """
+    root = tk.Tk()
+    root.withdraw()
+    return root
     
 def get_input_files():
     """
@@ -89,23 +286,21 @@ def get_input_files():
         list: Paths to the input .trl files.
     """
     ##print("Debug: Entering get_input_files function")
-    parser = argparse.ArgumentParser(description="Convert Ludii trial files to PGN.")
-    parser.add_argument("-f", "--files", nargs='+', help="Paths to the input .trl files")
-    args = parser.parse_args()
+    args = _get_args()
 
     if args.files:
         #print(f"Debug: Files provided via command line: {args.files}")
         return [ensure_file_extension(file, '.trl') for file in args.files]
     
     try:
-        root = tk.Tk()
-        root.withdraw()
+        _tk_root()
         file_paths = filedialog.askopenfilenames(filetypes=[("Ludii Trial files", "*.trl")])
         if file_paths:
             #print(f"Debug: Files selected via GUI: {file_paths}")
             return list(file_paths)
     except Exception as e:
         #print(f"Debug: Error in file dialog: {e}")
+        pass
     
     files = []
     while True:
@@ -117,6 +312,7 @@ def get_input_files():
             files.append(file_path_with_extension)
         else:
             #print("Invalid file path. Please try again.")
+            pass
     
     #print(f"Debug: Files entered manually: {files}")
     return files
@@ -135,10 +331,7 @@ def get_output_file(input_file):
     dialog if available, and falls back to manual input or a default name
     based on the input file.
     """
-    parser = argparse.ArgumentParser(description="Convert Ludii trial files to PGN.")
-    parser.add_argument("-f", "--file", help="Path to the input .trl file")
-    parser.add_argument("-o", "--output", help="Path to the output .pgn file")
-    args = parser.parse_args()
+    args = _get_args()
 
     if args.output:
         return ensure_file_extension(args.output, '.pgn')
@@ -146,10 +339,7 @@ def get_output_file(input_file):
     default_output = os.path.splitext(input_file)[0] + ".pgn"
     
     try:
-        import tkinter as tk
-        from tkinter import filedialog
-        root = tk.Tk()
-        root.withdraw()
+        _tk_root()
         file_path = filedialog.asksaveasfilename(
             defaultextension=".pgn",
             filetypes=[("PGN files", "*.pgn")],
@@ -178,9 +368,7 @@ def get_event_name(input_file):
     Returns:
         str: The event name for the chess game.
     """
-    parser = argparse.ArgumentParser(description="Convert Ludii trial files to PGN.")
-    parser.add_argument("-e", "--event", help="Name of the event")
-    args = parser.parse_args()
+    args = _get_args()
 
     if args.event:
         return args.event
@@ -188,8 +376,7 @@ def get_event_name(input_file):
     default_event = os.path.splitext(os.path.basename(input_file))[0]
     
     try:
-        root = tk.Tk()
-        root.withdraw()
+        _tk_root()
         event_name = simpledialog.askstring("Event Name", "Enter the event name:", initialvalue=default_event)
         if event_name:
             return event_name
@@ -210,17 +397,13 @@ def get_player_names(default_white="Player 1", default_black="Player 2"):
     Returns:
         tuple: A tuple containing the names of the white and black players.
     """
-    parser = argparse.ArgumentParser(description="Convert Ludii trial files to PGN.")
-    parser.add_argument("-w", "--white", help="Name of the white player")
-    parser.add_argument("-b", "--black", help="Name of the black player")
-    args = parser.parse_args()
+    args = _get_args()
 
     if args.white and args.black:
         return args.white, args.black
     
     try:
-        root = tk.Tk()
-        root.withdraw()
+        _tk_root()
         white_player = simpledialog.askstring("White Player", "Enter the name of the white player:", initialvalue=default_white)
         black_player = simpledialog.askstring("Black Player", "Enter the name of the black player:", initialvalue=default_black)
         if white_player and black_player:
@@ -242,11 +425,13 @@ def get_game_result(ludii_content):
     Returns:
         str: The game result in PGN format ('1-0', '0-1', '1/2-1/2', or '*').
     
-    This function searches for the 'winner=' line in the Ludii content
-    and translates it to the standard PGN result notation.
+    This function searches backwards for the last 'winner=' line in the
+    Ludii content and translates it to the standard PGN result notation.
     """
-    winner_line = next((line for line in reversed(ludii_content.split('\n')) if line.startswith('winner=')), None)
-    if winner_line:
+    winner_start = ludii_content.rfind('\nwinner=') + 1
+    if winner_start or ludii_content.startswith('winner='):
+        winner_end = ludii_content.find('\n', winner_start)
+        winner_line = ludii_content[winner_start:winner_end if winner_end != -1 else None]
         winner = int(winner_line.split('=')[1])
         if winner == 0:
             return "1/2-1/2"
@@ -269,7 +454,7 @@ def get_game_variant(ludii_content):
     This function extracts the game variant information from the first
     line of the Ludii content, which typically contains the game path.
     """
-    first_line = ludii_content.split('\n')[0]
+    first_line = ludii_content.partition('\n')[0]
     return first_line.strip()
     
 def filter_moves(input_file, output_file):
@@ -284,58 +469,64 @@ def filter_moves(input_file, output_file):
     and illegal moves), and writes the cleaned-up content to a new file. It's useful
     for removing extraneous information and focusing on the actual game moves.
     """
-    with open(input_file, 'r') as file:
+    with open(input_file, 'r', buffering=IO_BUFFER_SIZE) as file:
         lines = file.readlines()
 
     filtered_lines = []
-    i = 0
-    while i < len(lines):
-        if "Ignored: Setup move" in lines[i]:
-            for j in range(i-1, i-7, -1):
-                if j >= 0 and (lines[j].startswith("Move parsed:") or 
-                               lines[j].startswith("Debugging parse_ludii_move") or 
-                               lines[j].startswith("Original:") or 
-                               lines[j].startswith("Move") or
-                               lines[j].startswith("Black components before move") or
-                               lines[j].strip() == ""):
-                    if filtered_lines:
-                        filtered_lines.pop()
-            i += 1
-        elif "Parsed illegal move" in lines[i]:
-            for j in range(i-1, i-7, -1):
-                if j >= 0 and (lines[j].startswith("Parsing illegal move:") or 
-                               lines[j].startswith("Illegal move detected") or 
-                               lines[j].startswith("Original:") or 
-                               lines[j].startswith("Move") or
-                               lines[j].strip() == ""):
-                    if filtered_lines:
-                        filtered_lines.pop()
-            i += 1
+    # Context flags (setup, illegal) of the last six lines read, and how
+    # many of each are set, kept up to date as lines enter and leave
+    recent = deque(maxlen=6)
+    setup_count = illegal_count = 0
+    for line in lines:
+        if "Ignored: Setup move" in line:
+            context = setup_count
+        elif "Parsed illegal move" in line:
+            context = illegal_count
         else:
-            filtered_lines.append(lines[i])
-            i += 1
+            context = 0
+            filtered_lines.append(line)
 
-    filtered_lines = [line for line in filtered_lines if line.strip() != ""]
+        # Drop the log lines that led up to the ignored move
+        if context:
+            del filtered_lines[max(len(filtered_lines) - context, 0):]
 
-    with open(output_file, 'w') as file:
-        file.writelines(filtered_lines)
+        if len(recent) == recent.maxlen:
+            old_setup, old_illegal = recent[0]
+            setup_count -= old_setup
+            illegal_count -= old_illegal
+        match = _RE_CONTEXT_LINE.match(line)
+        setup, illegal = CONTEXT_FLAGS[match.lastgroup if match else None]
+        recent.append((setup, illegal))
+        setup_count += setup
+        illegal_count += illegal
+
+    filtered_lines = [line for line in filtered_lines if line.strip()]
+
+    with open(output_file, 'w', buffering=IO_BUFFER_SIZE) as file:
+        file.write(''.join(filtered_lines))
 
 def print_player_components(board, player):
     """
     Prints the current components (pieces) of a player on the board.
 
     Args:
-        board (dict): Dictionary representing the current chess board.
+        board (BoardState): The current chess board.
         player (int): The player whose components are to be printed (1 for white, 2 for black).
 
     This function is useful for debugging and visualizing the current state of a player's
     pieces on the board. It prints each piece's location and type.
+    Nothing is computed when DEBUG is False.
     """
+    if not DEBUG:
+        return
+
+    # Players are matched to colours by parity, like piece codes
+    color = 1 if player % 2 else 2
     components = []
-    for square, piece in board.items():
-        if piece % 2 == player % 2:
-            piece_symbol = PIECE_MAP.get(piece, '?')
-            components.append(f"{square}:{piece_symbol}")
+    for coord, piece in enumerate(board.pieces):
+        if PIECE_COLORS[piece] == color:
+            piece_symbol = PIECE_SYMBOLS[piece] or '?'
+            components.append(f"{ludii_to_algebraic(coord)}:{piece_symbol}")
     
     player_name = "White" if player == 1 else "Black"
     debug_print(f"{player_name} components before move: {', '.join(sorted(components))}")
@@ -345,7 +536,7 @@ def print_board(board):
     Creates a visual representation of the chess board.
     
     Args:
-        board (dict): Dictionary representing the chess board.
+        board (BoardState): The chess board.
     
     Returns:
         str: A string visually representing the chess board.
@@ -354,15 +545,11 @@ def print_board(board):
     where each piece is represented by its corresponding symbol.
     White pieces are in uppercase, black pieces in lowercase.
     Empty squares are represented by dots.
+    The symbols for all 64 squares are looked up in one bytes.translate
+    call and then laid out rank by rank, from rank 8 down to rank 1.
     """
-    board_str = ""
-    for rank in range(8, 0, -1):
-        for file in 'abcdefgh':
-            square = file + str(rank)
-            piece = board.get(square, '.')
-            board_str += PIECE_MAP.get(piece, '.') + ' '
-        board_str += '\n'
-    return board_str
+    symbols = board.pieces.translate(BOARD_SYMBOL_TABLE).decode('ascii')
+    return ''.join(' '.join(symbols[rank * 8:rank * 8 + 8]) + ' \n' for rank in range(7, -1, -1))
 
 def process_files(input_files):
     ##print("Debug: Entering process_files")
@@ -379,8 +566,7 @@ def process_files(input_files):
         round_number = 0 if is_single_file else index + 1
         #print(f"Debug: Processing round {round_number}, file: {input_file}")
         try:
-            with open(input_file, 'r') as file:
-                ludii_content = file.read()
+            ludii_content = read_trial_file(input_file)
 
             output_file_name = base_name
             if round_number > 1:
@@ -395,6 +581,7 @@ def process_files(input_files):
                 #print(f"Debug: Updated player names - White: {white_player}, Black: {black_player}")
             else:
                 ##print("Debug: Player names unchanged")
+                pass
             
             if is_single_file or round_number == 1:
                 output_file = base_output_file
@@ -446,8 +633,7 @@ def process_files(input_files):
 def get_player_names_gui(default_white, default_black, round_number):
     #print(f"Debug: Entering get_player_names_gui with defaults - Round: {round_number} White: {default_white}, Black: {default_black}")
     
-    root = tk.Tk()
-    root.withdraw()  # Hide the main window
+    _tk_root()  # Hidden main window shared by all dialogs
     
     # Use simpledialog to get input
     white_player = simpledialog.askstring("White Player", f"{'ROUND ' + str(round_number) + '-> ' if round_number != 0 else ''}Enter name for White player (default: {default_white}):", initialvalue=default_white)    
@@ -508,10 +694,11 @@ def order_files_gui(files):
         #print("Debug: Less than 2 files, returning original list")
         return files
 
-    root = tk.Tk()
-    root.title("Order Files")
+    # A window on the shared hidden root, so no second Tk interpreter is started
+    window = tk.Toplevel(_tk_root())
+    window.title("Order Files")
 
-    listbox = tk.Listbox(root, selectmode=tk.SINGLE)
+    listbox = tk.Listbox(window, selectmode=tk.SINGLE)
     for file in files:
         listbox.insert(tk.END, os.path.basename(file))
     listbox.pack(padx=10, pady=10)
@@ -534,29 +721,37 @@ def order_files_gui(files):
             listbox.insert(selected[0]+1, text)
             listbox.selection_set(selected[0]+1)
 
+    # Basenames in the order shown when the window was closed
+    ordered_names = []
+
     def confirm_order():
         #print("Debug: Order confirmed by user")
-        root.quit()
+        # Read the order before the window (and its listbox) is destroyed
+        ordered_names[:] = listbox.get(0, tk.END)
+        window.destroy()
 
-    tk.Button(root, text="Move Up", command=move_up).pack()
-    tk.Button(root, text="Move Down", command=move_down).pack()
-    tk.Button(root, text="Confirm Order", command=confirm_order).pack()
+    tk.Button(window, text="Move Up", command=move_up).pack()
+    tk.Button(window, text="Move Down", command=move_down).pack()
+    tk.Button(window, text="Confirm Order", command=confirm_order).pack()
+    # Closing the window from the title bar also confirms the current order
+    window.protocol("WM_DELETE_WINDOW", confirm_order)
 
-    #print("Debug: GUI setup complete, entering mainloop")
-    root.mainloop()
+    #print("Debug: GUI setup complete, waiting for the window to close")
+    # The shared root stays alive after the dialog closes, so wait for this
+    # window only instead of running the root's mainloop
+    window.wait_window()
 
-    #print("Debug: Mainloop exited")
+    #print("Debug: Window closed")
 
     # Create a mapping of basenames to full paths
     basename_to_path = {os.path.basename(f): f for f in files}
     print(f"Debug: basename_to_path mapping: {basename_to_path}")
 
     # Use this mapping to get the full paths in the new order
-    ordered_files = [basename_to_path[listbox.get(i)] for i in range(listbox.size())]
+    ordered_files = [basename_to_path[name] for name in ordered_names]
     
     print(f"Debug: Final ordered files: {ordered_files}")
 
-    root.destroy()
     return ordered_files
 
 def build_pgn_header(input_file, variant, result, round_number, output_file_name, white_player, black_player):
@@ -579,17 +774,19 @@ def build_pgn_header(input_file, variant, result, round_number, output_file_name
 
     event_name = output_file_name
     # Remove the round number from the event name if present
-    event_name = re.sub(r'-\d+$', '', event_name) 
-
-    pgn = f'[Event "{event_name}"]\n'
-    pgn += f'[Site "Ludii"]\n'
-    pgn += f'[Date "{get_file_creation_date(input_file)}"]\n'
-    if round_number != 0 : pgn += f'[Round "{round_number}"]\n'
-    pgn += f'[White "{white_player}"]\n'
-    pgn += f'[Black "{black_player}"]\n'
-    pgn += f'[Variant "{variant}"]\n'
-    pgn += f'[Result "{result}"]\n\n'
-    return pgn
+    event_name = _RE_ROUND_SUFFIX.sub('', event_name) 
+
+    parts = [
+        f'[Event "{event_name}"]\n',
+        '[Site "Ludii"]\n',
+        f'[Date "{get_file_creation_date(input_file)}"]\n',
+    ]
+    if round_number != 0 : parts.append(f'[Round "{round_number}"]\n')
+    parts.append(f'[White "{white_player}"]\n')
+    parts.append(f'[Black "{black_player}"]\n')
+    parts.append(f'[Variant "{variant}"]\n')
+    parts.append(f'[Result "{result}"]\n\n')
+    return "".join(parts)
 
 def remove_notes(move_str):
     """
@@ -602,9 +799,12 @@ def remove_notes(move_str):
         str: The move string with notes removed.
     
     This function uses a regular expression to remove any text
-    enclosed in curly braces {} from the move string.
+    enclosed in curly braces {} from the move string. Moves without
+    any braces are returned unchanged without running the regex.
     """
-    return re.sub(r'\s*\{[^}]*\}', '', move_str)
+    if '{' not in move_str:
+        return move_str
+    return _RE_NOTES_BRACES.sub('', move_str)
 
 def build_pgn_moves(white_moves, black_moves):
     """
@@ -620,15 +820,18 @@ def build_pgn_moves(white_moves, black_moves):
     This function combines white and black moves into the standard
     PGN format, removing any notes or comments from the moves.
     """
-    pgn = ""
+    parts = []
+    append = parts.append
     for i in range(max(len(white_moves), len(black_moves))):
-        pgn += f"{i+1}. "
+        append(f"{i+1}. ")
         if i < len(white_moves):
-            pgn += f"{remove_notes(white_moves[i])} "
+            append(remove_notes(white_moves[i]))
+            append(" ")
         if i < len(black_moves):
-            pgn += f"{remove_notes(black_moves[i])} "
-        pgn += "\n"
-    return pgn
+            append(remove_notes(black_moves[i]))
+            append(" ")
+        append("\n")
+    return "".join(parts)
 
 def build_pgn_moves_with_notes(white_moves, black_moves):
     """
@@ -646,15 +849,16 @@ def build_pgn_moves_with_notes(white_moves, black_moves):
     for variants like Kriegspiel where the notes contain important
     information about the game state.
     """
-    pgn = ""
+    parts = []
+    append = parts.append
     for i in range(max(len(white_moves), len(black_moves))):
-        pgn += f"{i+1}. "
+        append(f"{i+1}. ")
         if i < len(white_moves):
-            pgn += f"{white_moves[i]} "
+            append(f"{white_moves[i]} ")
         if i < len(black_moves):
-            pgn += f"{black_moves[i]} "
-        pgn += "\n"
-    return pgn
+            append(f"{black_moves[i]} ")
+        append("\n")
+    return "".join(parts)
 
 def ludii_to_pgn(ludii_content, input_file, round_number, event_name, white_player, black_player):
     """
@@ -697,8 +901,7 @@ def convert_trl_to_pgn(input_file, output_file):
     potential errors during the process.
     """
     try:
-        with open(input_file, 'r') as file:
-            ludii_content = file.read()
+        ludii_content = read_trial_file(input_file)
 
         try:
             pgn_output = ludii_to_pgn(ludii_content, input_file)
@@ -734,9 +937,7 @@ def ludii_to_algebraic(coord):
     Ludii uses a 0-63 coordinate system, where 0 is a1 and 63 is h8.
     This function converts that number to a standard chess letter-number pair.
     """
-    file = chr(ord('a') + (int(coord) % 8))
-    rank = str((int(coord) // 8) + 1)
-    return file + rank
+    return _LUDII_TO_ALG[int(coord)]
 
 def algebraic_to_ludii(alg):
     """
@@ -751,12 +952,61 @@ def algebraic_to_ludii(alg):
     This is the inverse operation of ludii_to_algebraic.
     Converts a chess letter-number pair to a 0-63 number.
     """
-    file = ord(alg[0]) - ord('a')
-    rank = int(alg[1]) - 1
-    return rank * 8 + file
+    return _ALG_TO_LUDII[alg]
 
 # Board management functions
 
+class BoardState:
+    """
+    The chess board together with one bitboard per piece code.
+    
+    Attributes:
+        pieces (bytearray): Piece codes indexed by Ludii coordinate (0 for empty).
+        bitboards (list): For each piece code from 1 to 12, an int whose bit n
+                          is set when that piece stands on Ludii coordinate n.
+        occupancy (list): Bitboards of all white (index 1) and all black
+                          (index 2) pieces; odd codes are white, even codes black.
+    
+    Squares are changed only through place() and clear(), which keep the
+    bitboards in step with pieces, so questions such as "which knights can
+    reach this square" are answered with a few integer operations instead
+    of a scan of the whole board.
+    """
+
+    def __init__(self):
+        self.pieces = bytearray(64)
+        self.bitboards = [0] * PIECE_CODES
+        self.occupancy = [0, 0, 0]
+
+    def pawns(self, player):
+        """
+        Returns the pawn bitboard of a player (1 for white, 2 for black).
+        """
+        return self.bitboards[player]
+
+    def place(self, coord, piece):
+        """
+        Puts a piece on a square, replacing whatever was there.
+        """
+        self.clear(coord)
+        self.pieces[coord] = piece
+        if piece:
+            self.occupancy[PIECE_COLORS[piece]] |= 1 << coord
+        if piece < PIECE_CODES:
+            self.bitboards[piece] |= 1 << coord
+
+    def clear(self, coord):
+        """
+        Empties a square and returns the piece code that was on it (0 if none).
+        """
+        piece = self.pieces[coord]
+        if piece:
+            self.occupancy[PIECE_COLORS[piece]] &= ~(1 << coord)
+        if piece < PIECE_CODES:
+            self.bitboards[piece] &= ~(1 << coord)
+        self.pieces[coord] = 0
+        return piece
+
 def setup_board(ludii_content):
     """
     Sets up the initial chess board based on Ludii content.
@@ -765,72 +1015,98 @@ def setup_board(ludii_content):
         ludii_content (str): The content of the Ludii file.
     
     Returns:
-        dict: A dictionary representing the chess board, where keys
-              are algebraic coordinates and values are piece codes.
+        BoardState: The chess board holding the initial setup.
     
     This function parses the Ludii content to extract initial setup moves
     and builds the board representation. It also compares the obtained
     configuration with the standard chess setup, logging any discrepancies
     to the debug log.
     """
-    board = {}
-    setup_moves = re.findall(r'Move=\[Move:mover=0.*?\]', ludii_content)
-    for move in setup_moves:
-        match = re.search(r'to=(\d+),.*?what=(\d+)', move)
+    board = BoardState()
+    # Squares in the order they were first set up, for the debug report
+    setup_coords = {}
+    # Setup moves form a contiguous block before the first player move,
+    # so there is no need to scan the rest of the trial for them
+    first_player_move = _RE_FIRST_PLAYER_MOVE.search(ludii_content)
+    setup_end = first_player_move.start() if first_player_move else len(ludii_content)
+    for setup_match in _RE_SETUP.finditer(ludii_content, 0, setup_end):
+        match = _RE_TO_WHAT.search(setup_match.group(0))
         if match:
             square, piece = match.groups()
-            board[ludii_to_algebraic(int(square))] = int(piece)
+            board.place(int(square), int(piece))
+            setup_coords.setdefault(int(square))
 
-    expected_setup = {
-        'a1': 3, 'b1': 9, 'c1': 7, 'd1': 11, 'e1': 5, 'f1': 7, 'g1': 9, 'h1': 3,
-        'a2': 1, 'b2': 1, 'c2': 1, 'd2': 1, 'e2': 1, 'f2': 1, 'g2': 1, 'h2': 1,
-        'a7': 2, 'b7': 2, 'c7': 2, 'd7': 2, 'e7': 2, 'f7': 2, 'g7': 2, 'h7': 2,
-        'a8': 4, 'b8': 10, 'c8': 8, 'd8': 12, 'e8': 6, 'f8': 8, 'g8': 10, 'h8': 4
-    }
-
-    if board != expected_setup:
+    if board.pieces != EXPECTED_SETUP_PIECES:
+        actual_setup = {ludii_to_algebraic(coord): board.pieces[coord] for coord in setup_coords}
         debug_print("Warning: Initial board setup does not match the expected configuration.")
-        debug_print("Expected:", expected_setup)
-        debug_print("Actual:", board)
+        debug_print("Expected:", EXPECTED_SETUP)
+        debug_print("Actual:", actual_setup)
 
     return board
 
-def update_board(board, from_sq, to_sq, promotion):
+def update_board(board, from_coord, to_coord, promotion):
     """
     Updates the chess board after a move.
     
     Args:
-        board (dict): Dictionary representing the chess board.
-        from_sq (str): Starting square in algebraic notation.
-        to_sq (str): Ending square in algebraic notation.
+        board (BoardState): The chess board.
+        from_coord (int): Starting square as a Ludii coordinate.
+        to_coord (int): Ending square as a Ludii coordinate.
         promotion (int): Code of the promoted piece, if applicable.
     
     Returns:
-        dict: The updated chess board.
+        BoardState: The updated chess board.
     
     This function updates the board by moving the piece from the starting
     square to the ending square. It also handles special cases like
     castling and pawn promotion.
     """
-    piece = board.pop(from_sq, None)
+    piece = board.clear(from_coord)
     if piece:
-        board[to_sq] = promotion if promotion else piece
+        board.place(to_coord, promotion if promotion else piece)
 
         # Handle castling
-        if piece in [5, 6] and abs(ord(from_sq[0]) - ord(to_sq[0])) == 2:
-            if to_sq[0] == 'g':  # Kingside castling
-                rook_from = 'h' + from_sq[1]
-                rook_to = 'f' + from_sq[1]
+        if piece in [5, 6] and abs(from_coord % 8 - to_coord % 8) == 2:
+            rank_start = from_coord - from_coord % 8
+            if to_coord % 8 == 6:  # Kingside castling
+                rook_from = rank_start + 7
+                rook_to = rank_start + 5
             else:  # Queenside castling
-                rook_from = 'a' + from_sq[1]
-                rook_to = 'd' + from_sq[1]
-            rook = board.pop(rook_from)
-            board[rook_to] = rook
+                rook_from = rank_start
+                rook_to = rank_start + 3
+            if board.pieces[rook_from]:
+                board.place(rook_to, board.clear(rook_from))
 
     return board
 
 # Move analysis and generation functions
 
+@functools.lru_cache(maxsize=2048)
+def extract_move_fields(move_str):
+    """
+    Extracts the mover, from, to and promotion fields of a Ludii move.
+    
+    Args:
+        move_str (str): String representing a move in Ludii format.
+    
+    Returns:
+        tuple: (mover, from_coord, to_coord, promotion) as ints, with None
+               for any field that is missing. promotion is the code of the
+               piece named by the first Promote action.
+    
+    All fields are collected in a single regex scan; the first
+    occurrence of each belongs to the move itself rather than to its
+    nested actions or notes. Results are cached, so a move string seen
+    again (such as a repeated illegal attempt) is not scanned twice.
+    """
+    fields = {}
+    for key, value, promotion in _RE_MOVE_FIELDS.findall(move_str):
+        if key:
+            fields.setdefault(key, int(value))
+        else:
+            fields.setdefault('promotion', int(promotion))
+    return fields.get('mover'), fields.get('from'), fields.get('to'), fields.get('promotion')
+
 def parse_ludii_move(move_str):
     """
     Parses a move in Ludii format.
@@ -839,58 +1115,41 @@ def parse_ludii_move(move_str):
         move_str (str): String representing a move in Ludii format.
     
     Returns:
-        tuple: A tuple containing (player, from_square, to_square,
+        tuple: A tuple containing (player, from_coord, to_coord,
                is_capture, promotion, notes) or None if parsing fails.
+               The squares are Ludii coordinates.
     
     This function extracts all relevant information from a Ludii move string,
     including the moving player, start and end squares, whether it's a capture,
     any promotions, and additional notes. It also handles illegal moves and
     groups notes by player.
     """
-    debug_print(f"Debugging parse_ludii_move. Input: {move_str}")
+    if DEBUG:
+        debug_print(f"Debugging parse_ludii_move. Input: {move_str}")
 
     if 'Illegal move' in move_str:
         debug_print("Illegal move detected")
         return None
 
     # Extract basic move information
-    mover_match = re.search(r'mover=(\d+)', move_str)
-    from_match = re.search(r'from=(\d+)', move_str)
-    to_match = re.search(r'to=(\d+)', move_str)
+    player, from_coord, to_coord, promotion = extract_move_fields(move_str)
 
-    # Extract and group notes
-    notes = re.findall(r'\[Note:message=(.*?),to=(\d+)\]', move_str)
+    # Extract and group notes by message, as a bitmask of the players
+    # each message was sent to (bit n for player n)
     grouped_notes = {}
-    for note in notes:
-        message, to_player = note
-        if message in grouped_notes:
-            grouped_notes[message].add(to_player)
-        else:
-            grouped_notes[message] = {to_player}
-
-    combined_notes = []
-    for message, players in grouped_notes.items():
-        if len(players) > 1:
-            combined_notes.append((message, 'player 1 & player 2'))
-        else:
-            combined_notes.append((message, f"player {players.pop()}"))
-
-    if mover_match and from_match and to_match:
-        player = int(mover_match.group(1))
-        from_coord = int(from_match.group(1))
-        to_coord = int(to_match.group(1))
-
-        from_sq = ludii_to_algebraic(from_coord)
-        to_sq = ludii_to_algebraic(to_coord)
+    for message, to_player in _RE_NOTE.findall(move_str):
+        grouped_notes[message] = grouped_notes.get(message, 0) | 1 << int(to_player)
+    combined_notes = [
+        (message, 'player 1 & player 2' if players & (players - 1) else f"player {players.bit_length() - 1}")
+        for message, players in grouped_notes.items()
+    ]
+
+    if player is not None and from_coord is not None and to_coord is not None:
         is_capture = 'Remove:' in move_str or 'CapturedPiece' in move_str
-        promotion = None
-        if 'Promote:' in move_str:
-            promotion_match = re.search(r'Promote:.*?what=(\d+)', move_str)
-            if promotion_match:
-                promotion = int(promotion_match.group(1))
 
-        debug_print(f"Move parsed: player={player}, from={from_sq}, to={to_sq}, capture={is_capture}, promotion={promotion}, notes={combined_notes}")
-        return player, from_sq, to_sq, is_capture, promotion, combined_notes
+        if DEBUG:
+            debug_print(f"Move parsed: player={player}, from={ludii_to_algebraic(from_coord)}, to={ludii_to_algebraic(to_coord)}, capture={is_capture}, promotion={promotion}, notes={combined_notes}")
+        return player, from_coord, to_coord, is_capture, promotion, combined_notes
 
     debug_print("Move parsing failed")
     return None
@@ -901,7 +1160,7 @@ def parse_illegal_move(move_str, board):
     
     Args:
         move_str (str): String representing an illegal move.
-        board (dict): Dictionary representing the current chess board.
+        board (BoardState): The current chess board.
     
     Returns:
         str: A string representing the illegal move in a readable format,
@@ -911,56 +1170,87 @@ def parse_illegal_move(move_str, board):
     such as the starting and ending squares and the type of piece involved.
     Useful for debugging and providing feedback on illegal moves.
     """
-    debug_print(f"Parsing illegal move: {move_str}")
-    from_match = re.search(r'from=(\d+)', move_str)
-    to_match = re.search(r'to=(\d+)', move_str)
+    if DEBUG:
+        debug_print(f"Parsing illegal move: {move_str}")
+    _, from_coord, to_coord, _ = extract_move_fields(move_str)
     
-    if from_match and to_match:
-        from_sq = ludii_to_algebraic(int(from_match.group(1)))
-        to_sq = ludii_to_algebraic(int(to_match.group(1)))
-        piece = board.get(from_sq)
-        piece_symbol = PIECE_MAP.get(piece, '')
+    if from_coord is not None and to_coord is not None:
+        from_sq = ludii_to_algebraic(from_coord)
+        to_sq = ludii_to_algebraic(to_coord)
+        piece = board.pieces[from_coord]
+        piece_symbol = PIECE_SYMBOLS[piece]
         
         if piece_symbol == 'P':
             return f"{from_sq}-{to_sq}"
         elif piece_symbol:
             return f"{piece_symbol}{from_sq}-{to_sq}"
     
-    debug_print(f"Failed to parse illegal move: {move_str}")
+    if DEBUG:
+        debug_print(f"Failed to parse illegal move: {move_str}")
     return None
 
-def is_legal_pawn_capture(from_sq, to_sq, player):
+def find_pawn_tries(board, player, from_coord, to_coord):
     """
-    Checks if a pawn capture is legal.
+    Finds the possible pawn captures as Ludii coordinates.
     
     Args:
-        from_sq (str): Starting square in algebraic notation.
-        to_sq (str): Ending square in algebraic notation.
-        player (int): Player making the move (1 for white, 2 for black).
+        board (BoardState): The current chess board.
+        player (int): Player whose pawns are checked (1 for white, 2 for black).
+        from_coord (int): Starting square of the last move as a Ludii coordinate.
+        to_coord (int): Ending square of the last move as a Ludii coordinate.
     
     Returns:
-        bool: True if the pawn capture is legal, False otherwise.
+        list: Tuples of (pawn_coord, target_coord, is_en_passant).
     
-    This function checks if the pawn capture follows the correct diagonal
-    movement pattern for the given player.
+    This is the integer-only core of calculate_pawn_tries: it builds no
+    strings, so it stays cheap on every move.
     """
-    file_diff = abs(ord(from_sq[0]) - ord(to_sq[0]))
-    rank_diff = int(to_sq[1]) - int(from_sq[1])
-    
-    if player == 1:  # White
-        return file_diff == 1 and rank_diff == 1
-    else:  # Black
-        return file_diff == 1 and rank_diff == -1
+    pieces = board.pieces
+    tries = []
 
-def calculate_pawn_tries(board, player, from_sq, to_sq):
+    # Check for en passant possibility
+    if pieces[to_coord] in (1, 2):  # If the moved piece is a pawn
+        if abs(to_coord // 8 - from_coord // 8) == 2:  # If it's a double step
+            en_passant_rank = from_coord // 8 + (1 if player == 2 else -1)
+            if 0 <= en_passant_rank < 8:
+                to_file = to_coord % 8
+                en_passant_coord = en_passant_rank * 8 + to_file
+                for adj_file in (to_file - 1, to_file + 1):
+                    if 0 <= adj_file < 8 and pieces[en_passant_rank * 8 + adj_file] == player:
+                        tries.append((en_passant_rank * 8 + adj_file, en_passant_coord, True))
+
+    # Squares attacked by all of the player's pawns at once, and the opposing pieces;
+    # if they don't meet there are no regular captures and the scan below is skipped
+    pawns = board.pawns(player)
+    if player == 1:
+        attacked = (pawns & ~FILE_MASKS[7]) << 9 | (pawns & ~FILE_MASKS[0]) << 7
+    else:
+        attacked = (pawns & ~FILE_MASKS[0]) >> 9 | (pawns & ~FILE_MASKS[7]) >> 7
+    opponents = board.occupancy[3 - player]
+    if not attacked & opponents:
+        return tries
+
+    # Check for regular pawn captures, visiting only the player's pawns
+    # (lowest bit first, i.e. in coordinate order, so the debug log stays stable)
+    capture_targets = PAWN_CAPTURE_TARGETS[player]
+    while pawns:
+        coord = (pawns & -pawns).bit_length() - 1
+        pawns &= pawns - 1
+        for cap_coord in capture_targets[coord]:
+            if opponents >> cap_coord & 1:
+                tries.append((coord, cap_coord, False))
+
+    return tries
+
+def calculate_pawn_tries(board, player, from_coord, to_coord):
     """
     Calculates the number of possible pawn captures.
     
     Args:
-        board (dict): Dictionary representing the current chess board.
+        board (BoardState): The current chess board.
         player (int): Player making the move (1 for white, 2 for black).
-        from_sq (str): Starting square of the last move in algebraic notation.
-        to_sq (str): Ending square of the last move in algebraic notation.
+        from_coord (int): Starting square of the last move as a Ludii coordinate.
+        to_coord (int): Ending square of the last move as a Ludii coordinate.
     
     Returns:
         tuple: A tuple containing the number of pawn capture attempts and
@@ -968,58 +1258,35 @@ def calculate_pawn_tries(board, player, from_sq, to_sq):
     
     This function calculates how many pawns of the opposite color can
     potentially capture on the square where a piece just moved. It also
-    checks for en passant possibilities.
+    checks for en passant possibilities. The search itself is done by
+    find_pawn_tries; this wrapper formats the moves for the debug log.
     """
-    debug_print(f"calculate_pawn_tries called with:")
-    debug_print(f"  board: {board} //{{")
-    debug_print(f"  player: {player}")
-    debug_print(f"  from_sq: {from_sq}, to_sq: {to_sq}")
-
-    tries = 0
-    try_moves = []
+    if DEBUG:
+        debug_print(f"calculate_pawn_tries called with:")
+        debug_print(f"  board: { {ludii_to_algebraic(coord): piece for coord, piece in enumerate(board.pieces) if piece} } //{{")
+        debug_print(f"  player: {player}")
+        debug_print(f"  from_sq: {ludii_to_algebraic(from_coord)}, to_sq: {ludii_to_algebraic(to_coord)}")
+
+    try_coords = find_pawn_tries(board, player, from_coord, to_coord)
+    tries = len(try_coords)
+    try_moves = [
+        f"{ludii_to_algebraic(pawn)}-{ludii_to_algebraic(target)}{' (en passant)' if en_passant else ''}"
+        for pawn, target, en_passant in try_coords
+    ]
 
-    # Check for en passant possibility
-    if board.get(to_sq) in [1, 2]:  # If the moved piece is a pawn
-        if abs(int(to_sq[1]) - int(from_sq[1])) == 2:  # If it's a double step
-            en_passant_rank = int(from_sq[1]) + (1 if player == 2 else -1)
-            en_passant_square = to_sq[0] + str(en_passant_rank)
-            adjacent_files = [chr(ord(to_sq[0]) - 1), chr(ord(to_sq[0]) + 1)]
-            
-            for adj_file in adjacent_files:
-                pawn_square = adj_file + str(en_passant_rank)
-                if pawn_square in board and board[pawn_square] == player:
-                    tries += 1
-                    try_moves.append(f"{pawn_square}-{en_passant_square} (en passant)")
-
-    # Check for regular pawn captures
-    for square, piece in board.items():
-        if piece == player:
-            file, rank = square[0], int(square[1])
-            capture_squares = []
-
-            if player == 1:  # White
-                capture_squares = [chr(ord(file) - 1) + str(rank + 1), chr(ord(file) + 1) + str(rank + 1)]
-            else:  # Black
-                capture_squares = [chr(ord(file) - 1) + str(rank - 1), chr(ord(file) + 1) + str(rank - 1)]
-
-            for cap_square in capture_squares:
-                if cap_square in board and board[cap_square] != player and board[cap_square] % 2 != player % 2:
-                    if is_legal_pawn_capture(square, cap_square, player):
-                        tries += 1
-                        try_moves.append(f"{square}-{cap_square}")
-
-    debug_print(f"Pawn tries: {tries}")
-    debug_print(f"Try moves: {try_moves}")
+    if DEBUG:
+        debug_print(f"Pawn tries: {tries}")
+        debug_print(f"Try moves: {try_moves}")
     return tries, try_moves
 
-def generate_pgn_move(board, from_sq, to_sq, is_capture, promotion, notes, player, illegal_moves):
+def generate_pgn_move(board, from_coord, to_coord, is_capture, promotion, notes, player, illegal_moves):
     """
     Generates a move in PGN (Portable Game Notation) format.
     
     Args:
-        board (dict): Dictionary representing the current chess board.
-        from_sq (str): Starting square in algebraic notation.
-        to_sq (str): Ending square in algebraic notation.
+        board (BoardState): The current chess board.
+        from_coord (int): Starting square as a Ludii coordinate.
+        to_coord (int): Ending square as a Ludii coordinate.
         is_capture (bool): True if the move is a capture, False otherwise.
         promotion (int): Code of the promoted piece, if applicable.
         notes (list): List of tuples containing additional notes about the move.
@@ -1027,59 +1294,65 @@ def generate_pgn_move(board, from_sq, to_sq, is_capture, promotion, notes, playe
         illegal_moves (list): List of illegal moves attempted before this move.
     
     Returns:
-        tuple: A tuple containing the PGN move string and the updated board.
+        tuple: A tuple containing the PGN move string and the updated board
+               (the same object as board, which is modified in place).
     
     This function generates a PGN representation of a chess move, including
     additional information like captures, promotions, checks, and illegal move attempts.
     It also updates the board state and calculates potential pawn captures.
     """
-    piece = board.get(from_sq, 1)
-    piece_symbol = PIECE_MAP.get(piece, '')
+    piece = board.pieces[from_coord] or 1
+    piece_symbol = PIECE_SYMBOLS[piece]
 
-    move_str = generate_basic_move_string(board, from_sq, to_sq, is_capture, promotion, piece_symbol)
+    move_str = generate_basic_move_string(board, from_coord, to_coord, is_capture, promotion, piece_symbol)
 
-    new_board = update_board(board.copy(), from_sq, to_sq, promotion)
+    # The board is updated in place; everything needed from the position
+    # before the move has been read above
+    update_board(board, from_coord, to_coord, promotion)
 
     umpire_info = []
     
     if is_capture:
-        umpire_info.append(f"X{to_sq.lower()}")
-
-    is_check = any("check" in note.lower() for note, _ in notes)
-    if is_check:
-        check_types = [note.split()[0].lower() for note, _ in notes if "check" in note.lower()]
-        check_str = "C" + "".join(check_type[0].upper() for check_type in check_types)
-        umpire_info.append(check_str)
+        umpire_info.append(f"X{_LUDII_TO_ALG[to_coord]}")
+
+    # Collect the initial of each check type (the first word of a check note) in one pass
+    check_initials = []
+    for note, _ in notes:
+        note = note.lower()
+        if "check" in note:
+            check_initials.append(note.lstrip()[0].upper())
+    if check_initials:
+        umpire_info.append("C" + "".join(check_initials))
     else:
-        # Calculate pawn tries only if the move doesn't result in a check
-        pawn_tries, try_moves = calculate_pawn_tries(new_board, 3 - player, from_sq, to_sq)
+        # Calculate pawn tries only if the move doesn't result in a check; the
+        # try moves are only formatted when they are written to the debug log
+        if DEBUG:
+            pawn_tries, try_moves = calculate_pawn_tries(board, 3 - player, from_coord, to_coord)
+        else:
+            pawn_tries, try_moves = len(find_pawn_tries(board, 3 - player, from_coord, to_coord)), []
         if pawn_tries > 0:
             umpire_info.append(f"P{pawn_tries}")
-        if try_moves:
+        if DEBUG and try_moves:
             debug_print(f"Pawn try moves: {', '.join(try_moves)}")
 
-    comment = "{"
-    if umpire_info:
-        comment += ",".join(umpire_info)
-    
+    parts = [move_str, " {", ",".join(umpire_info)]
     if illegal_moves:
-        comment += ":" if umpire_info else ":"
-        comment += ",".join(illegal_moves)
+        parts.append(":")
+        parts.append(",".join(illegal_moves))
     elif umpire_info:
-        comment += ":"
-
-    comment += "}"
+        parts.append(":")
+    parts.append("}")
 
-    return f"{move_str} {comment}", new_board
+    return "".join(parts), board
 
-def generate_basic_move_string(board, from_sq, to_sq, is_capture, promotion, piece_symbol):
+def generate_basic_move_string(board, from_coord, to_coord, is_capture, promotion, piece_symbol):
     """
     Generates a basic move string in algebraic notation.
     
     Args:
-        board (dict): Dictionary representing the current chess board.
-        from_sq (str): Starting square in algebraic notation.
-        to_sq (str): Ending square in algebraic notation.
+        board (BoardState): The current chess board.
+        from_coord (int): Starting square as a Ludii coordinate.
+        to_coord (int): Ending square as a Ludii coordinate.
         is_capture (bool): True if the move is a capture, False otherwise.
         promotion (int): Code of the promoted piece, if applicable.
         piece_symbol (str): Symbol of the piece being moved.
@@ -1090,32 +1363,35 @@ def generate_basic_move_string(board, from_sq, to_sq, is_capture, promotion, pie
     This function creates the core part of the move notation, handling
     special cases like castling, pawn moves, captures, and promotions.
     It also resolves ambiguities when multiple pieces of the same type
-    can move to the same square.
+    can move to the same square. Squares are only turned into strings
+    here, when the notation is written.
     """
     if piece_symbol == 'K':
-        if from_sq == 'e1' and to_sq == 'g1':
-            return "O-O"
-        elif from_sq == 'e1' and to_sq == 'c1':
-            return "O-O-O"
-        elif from_sq == 'e8' and to_sq == 'g8':
-            return "O-O"
-        elif from_sq == 'e8' and to_sq == 'c8':
-            return "O-O-O"
+        castling = CASTLING_MOVES.get((from_coord, to_coord))
+        if castling:
+            return castling
 
+    from_sq = _LUDII_TO_ALG[from_coord]
+    to_sq = _LUDII_TO_ALG[to_coord]
     move = ""
     if piece_symbol == 'P':
-        if from_sq[0] != to_sq[0]:  # Pawn capture
+        if from_coord % 8 != to_coord % 8:  # Pawn capture
             move = f"{from_sq[0]}x{to_sq}"
         else:
             move = to_sq
     else:
         move = piece_symbol
 
-        ambiguous_pieces = [sq for sq, p in board.items() if p == board.get(from_sq) and sq != from_sq and can_move_to(sq, to_sq, p)]
-        if ambiguous_pieces:
-            if all(sq[0] != from_sq[0] for sq in ambiguous_pieces):
+        moved_piece = board.pieces[from_coord]
+        # Other pieces of the same kind that can reach the target square
+        # (the attack patterns are symmetric, so they are looked up from to_coord)
+        ambiguous = 0
+        if moved_piece < PIECE_CODES:
+            ambiguous = board.bitboards[moved_piece] & PIECE_ATTACKS[moved_piece][to_coord] & ~(1 << from_coord)
+        if ambiguous:
+            if not ambiguous & FILE_MASKS[from_coord % 8]:
                 move += from_sq[0]
-            elif all(sq[1] != from_sq[1] for sq in ambiguous_pieces):
+            elif not ambiguous & RANK_MASKS[from_coord // 8]:
                 move += from_sq[1]
             else:
                 move += from_sq
@@ -1125,45 +1401,10 @@ def generate_basic_move_string(board, from_sq, to_sq, is_capture, promotion, pie
         move += to_sq
 
     if promotion:
-        move += f"={PIECE_MAP.get(promotion, 'Q')}"
+        move += f"={PIECE_SYMBOLS[promotion] or 'Q'}"
 
     return move
 
-def can_move_to(from_sq, to_sq, piece):
-    """
-    Checks if a piece can move from one square to another.
-    
-    Args:
-        board (dict): Dictionary representing the current chess board.
-        from_sq (str): Starting square in algebraic notation.
-        to_sq (str): Ending square in algebraic notation.
-        piece (int): Code of the piece being moved.
-    
-    Returns:
-        bool: True if the move is possible, False otherwise.
-    
-    This function provides a basic check for whether a piece can move
-    between two squares, based on the piece type and the board layout.
-    It doesn't account for all chess rules (like check), but helps in
-    identifying potential legal moves.
-    """
-    piece_symbol = PIECE_MAP.get(piece, '')
-    file_diff = abs(ord(from_sq[0]) - ord(to_sq[0]))
-    rank_diff = abs(int(from_sq[1]) - int(to_sq[1]))
-
-    if piece_symbol == 'R':
-        return file_diff == 0 or rank_diff == 0
-    elif piece_symbol == 'N':
-        return (file_diff == 1 and rank_diff == 2) or (file_diff == 2 and rank_diff == 1)
-    elif piece_symbol == 'B':
-        return file_diff == rank_diff
-    elif piece_symbol == 'Q':
-        return file_diff == 0 or rank_diff == 0 or file_diff == rank_diff
-    elif piece_symbol == 'K':
-        return file_diff <= 1 and rank_diff <= 1
-
-    return True  # For pawns or unknown pieces, assume it's possible
-
 def convert_chess(ludii_content, input_file, round_number, event_name, white_player, black_player):
     """
     Converts a standard chess game from Ludii format to PGN.
@@ -1184,31 +1425,33 @@ def convert_chess(ludii_content, input_file, round_number, event_name, white_pla
 
     board = setup_board(ludii_content)
     
-    moves = [line for line in ludii_content.split('\n') if line.startswith('Move=')]
+    moves = _RE_MOVE_LINE.findall(ludii_content)
     white_moves = []
     black_moves = []
     
     for move in moves:
-        debug_print(f"\nOriginal: {move}")
+        if DEBUG:
+            debug_print(f"\nOriginal: {move}")
 
         parsed = parse_ludii_move(move)
         if parsed:
-            player, from_sq, to_sq, is_capture, promotion, notes = parsed
+            player, from_coord, to_coord, is_capture, promotion, notes = parsed
 
             print_player_components(board, player)
 
             if player in [1, 2]:
-                pgn_move, board = generate_pgn_move(board, from_sq, to_sq, is_capture, promotion, notes, player, [])
+                pgn_move, board = generate_pgn_move(board, from_coord, to_coord, is_capture, promotion, notes, player, [])
                 
                 if player == 1:
                     white_moves.append(pgn_move)
                 else:
                     black_moves.append(pgn_move)
 
-                debug_print(f"Converted: {pgn_move} //{{")
+                if DEBUG:
+                    debug_print(f"Converted: {pgn_move} //{{")
 
-                debug_print("Board after move:")
-                debug_print(print_board(board))
+                    debug_print("Board after move:")
+                    debug_print(print_board(board))
             else:
                 debug_print("Ignored: Setup move")
         else:
@@ -1216,16 +1459,18 @@ def convert_chess(ludii_content, input_file, round_number, event_name, white_pla
 
     result = get_game_result(ludii_content)
 
-    pgn = build_pgn_header(input_file, "Chess", result, round_number, event_name, white_player, black_player)
-    pgn += build_pgn_moves(white_moves, black_moves)
-    pgn += result
+    parts = [
+        build_pgn_header(input_file, "Chess", result, round_number, event_name, white_player, black_player),
+        build_pgn_moves(white_moves, black_moves),
+        result,
+    ]
 
     if DEBUG:
-        pgn += "\n\n{Debug Log:\n"
-        pgn += '\n'.join(debug_log)
-        pgn += "\n}"
+        parts.append("\n\n{Debug Log:\n")
+        parts.append('\n'.join(debug_log))
+        parts.append("\n}")
 
-    return pgn
+    return ''.join(parts)
 
 def convert_kriegspiel(ludii_content, input_file, round_number, event_name, white_player, black_player):
     """
@@ -1247,55 +1492,67 @@ def convert_kriegspiel(ludii_content, input_file, round_number, event_name, whit
 
     board = setup_board(ludii_content)
     
-    moves = [line for line in ludii_content.split('\n') if line.startswith('Move=')]
+    moves = _RE_MOVE_LINE.findall(ludii_content)
     white_moves = []
     black_moves = []
 
     illegal_moves = []
+    # (index, parse result) of the move last parsed by the promotion lookahead
+    lookahead = None
     
     i = 0
     while i < len(moves):
-        debug_print(f"\nMove {i+1}:")
-        debug_print(f"Original: {moves[i]}")
+        if DEBUG:
+            debug_print(f"\nMove {i+1}:")
+            debug_print(f"Original: {moves[i]}")
 
         if 'Illegal move' in moves[i]:
             debug_print("Illegal move detected")
             illegal_move = parse_illegal_move(moves[i], board)
             if illegal_move:
                 illegal_moves.append(illegal_move)
-                debug_print(f"Parsed illegal move: {illegal_move}")
+                if DEBUG:
+                    debug_print(f"Parsed illegal move: {illegal_move}")
             else:
                 debug_print("Failed to parse illegal move")
             i += 1
             continue
 
-        parsed = parse_ludii_move(moves[i])
+        if lookahead and lookahead[0] == i:
+            parsed = lookahead[1]
+        else:
+            parsed = parse_ludii_move(moves[i])
         if parsed:
-            player, from_sq, to_sq, is_capture, promotion, notes = parsed
+            player, from_coord, to_coord, is_capture, promotion, notes = parsed
 
             print_player_components(board, player)
 
             if i + 1 < len(moves) and 'Promote:' in moves[i+1]:
                 next_parsed = parse_ludii_move(moves[i+1])
-                if next_parsed and next_parsed[1] == to_sq and next_parsed[2] == to_sq:
+                # Reuse this parse when the move gets its own turn (in debug
+                # mode it is parsed again so the log shows it in place)
+                if not DEBUG:
+                    lookahead = (i + 1, next_parsed)
+                if next_parsed and next_parsed[1] == to_coord and next_parsed[2] == to_coord:
                     promotion = next_parsed[4]
                     i += 1
 
             if player in [1, 2]:
-                pgn_move, new_board = generate_pgn_move(board, from_sq, to_sq, is_capture, promotion, notes, player, illegal_moves)
+                pgn_move, board = generate_pgn_move(board, from_coord, to_coord, is_capture, promotion, notes, player, illegal_moves)
                 
                 if player == 1:
                     white_moves.append(pgn_move)
                 else:
                     black_moves.append(pgn_move)
 
-                debug_print(f"Converted: {pgn_move} //{{")
+                if DEBUG:
+                    debug_print(f"Converted: {pgn_move} //{{")
 
                 illegal_moves = []
-                board = new_board
 
-                debug_print("Board after move:")
-                debug_print(print_board(board))
+                if DEBUG:
+                    debug_print("Board after move:")
+                    debug_print(print_board(board))
             else:
                 debug_print("Ignored: Setup move")
         else:
@@ -1305,24 +1562,21 @@ def convert_kriegspiel(ludii_content, input_file, round_number, event_name, whit
 
     result = get_game_result(ludii_content)
 
-    pgn = build_pgn_header(input_file, "Kriegspiel (chess)", result, round_number, event_name, white_player, black_player)
-    pgn += build_pgn_moves_with_notes(white_moves, black_moves)
-    pgn += result
+    parts = [
+        build_pgn_header(input_file, "Kriegspiel (chess)", result, round_number, event_name, white_player, black_player),
+        build_pgn_moves_with_notes(white_moves, black_moves),
+        result,
+    ]
 
     if DEBUG:
-        pgn += "\n\n{Debug Log:\n"
-        pgn += '\n'.join(debug_log)
-        pgn += "\n}"
+        parts.append("\n\n{Debug Log:\n")
+        parts.append('\n'.join(debug_log))
+        parts.append("\n}")
 
-    return pgn
+    return ''.join(parts)
 
 def parse_arguments():
-    parser = argparse.ArgumentParser(description="Convert Ludii trial files to PGN.")
-    parser.add_argument("-f", "--files", nargs='+', help="Paths to the input .trl files")
-    parser.add_argument("-o", "--output", help="Path to the output .pgn file")
-    parser.add_argument("-w", "--white", help="Name of the white player")
-    parser.add_argument("-b", "--black", help="Name of the black player")
-    return parser.parse_args()
+    return _get_args()
 
 def get_input_files_cli():
     files = []
@@ -1355,8 +1609,7 @@ def process_files(input_files, output_file, white_player, black_player):
         round_number = 0 if is_single_file else index
         print(f"Debug: Processing round {round_number}, file: {input_file}")
         try:
-            with open(input_file, 'r') as file:
-                ludii_content = file.read()
+            ludii_content = read_trial_file(input_file)
 
             if is_single_file:
                 current_output_file = output_file
@@ -1404,8 +1657,7 @@ def main():
         input_files = [ensure_file_extension(file, '.trl') for file in args.files]
     else:
         try:
-            root = tk.Tk()
-            root.withdraw()
+            _tk_root()
             input_files = list(filedialog.askopenfilenames(filetypes=[("Ludii Trial files", "*.trl")]))
         except:
             print("GUI not available. Using command line input.")